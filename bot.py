@@ -1,25 +1,83 @@
 import discord
-from discord.ext import commands, tasks
-import requests
+from discord import app_commands
+from discord.ext import commands
+import aiohttp
+import aiosqlite
+import ijson
+import orjson
 import os
 import datetime
+import functools
+import itertools
 import asyncio
 import json
+import logging
+import logging.handlers
+import queue
 import random
+import time
 from dotenv import load_dotenv
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
 
 # Load environment variables
 load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
 GEOGUESSR_TOKEN = os.getenv('GEOGUESSR_TOKEN')
 
+# Log records are only queued on the event loop; a listener thread, started under
+# __main__, does the stdout writes
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-8s %(name)s: %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+log = logging.getLogger('bot')
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+log.setLevel(logging.INFO)
+# The listener already writes every record; don't hand them to root handlers too
+log.propagate = False
+
+# GeoGuessr endpoints and the static request headers, built once
+CHALLENGES_URL = "https://www.geoguessr.com/api/v3/challenges"
+HIGHSCORES_URL = "https://www.geoguessr.com/api/v3/results/highscores/"
+PLAY_URL = "https://www.geoguessr.com/challenge/"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 # Channel configuration - add your specific channel IDs here
 ALLOWED_CHANNELS = [1386753541309468702, 1386746260819804220]
 
 # Alternative: use environment variables for flexibility
 # ALLOWED_CHANNELS = [int(x) for x in os.getenv('ALLOWED_CHANNELS', '1386753541309468702,1386746260819804220').split(',') if x]
 
+# Set used by the command channel check; ALLOWED_CHANNELS keeps the order (first = daily posts)
+_ALLOWED_CHANNEL_IDS = frozenset(ALLOWED_CHANNELS)
+
+# Guild the slash commands are synced to (shows up instantly); unset syncs them globally
+SYNC_GUILD_ID = os.getenv('DISCORD_GUILD_ID')
+
+# Daily challenges are posted at this time (UTC)
+DAILY_POST_TIME = datetime.time(hour=12, minute=0)
+
+# SQLite file that keeps challenges across restarts
+CHALLENGE_DB = os.getenv('CHALLENGE_DB', 'challenges.db')
+
+# How long (seconds) a fetched leaderboard is reused before asking GeoGuessr again
+RESULTS_CACHE_TTL = 30
+
+# Challenges younger than this (seconds) are reported as empty without asking GeoGuessr
+FRESH_CHALLENGE_SECONDS = 60
+
+# Number of ranked players kept from a leaderboard and shown in embeds
+LEADERBOARD_SIZE = 10
+
+# Transient GeoGuessr failures are retried with exponential backoff
+RETRY_ATTEMPTS = 3
+RETRY_START_TIMEOUT = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Statuses where GeoGuessr has certainly not acted, so even a challenge POST may be resent
+NON_IDEMPOTENT_RETRY_STATUSES = {429, 503}
+
 # Enhanced configuration with multiple maps and game modes
 GAME_MODES = {
     'nomove': {
@@ -51,6 +109,9 @@ GAME_MODES = {
     }
 }
 
+# "**Name** | **90s**" description part per mode, so embeds don't re-walk the settings
+_MODE_DESC = {k: f"**{v['name']}** | **{v['settings']['timeLimit']}s**" for k, v in GAME_MODES.items()}
+
 # Map configurations
 MAPS = {
     'community_world': {
@@ -86,233 +147,520 @@ DAILY_ROTATION = [
     {'map': 'informed_world', 'mode': 'nomove'}      # Sunday
 ]
 
-# Enhanced storage for multiple challenges
-challenge_history = []
-current_challenge = {
-    'id': None,
-    'url': None,
-    'map': None,
-    'mode': None,
-    'created_at': None,
-    'day_number': 0
+# (map, mode) per weekday, so a lookup is one index and an unpack
+_ROTATION_TUP = tuple((r['map'], r['mode']) for r in DAILY_ROTATION)
+
+# Encoded challenge-creation bodies for every map/mode pair, built once
+CHALLENGE_PAYLOADS = {
+    (map_key, mode_key): orjson.dumps({
+        "map": map_config['id'],
+        **mode_config['settings']  # Unpack the mode-specific settings
+    })
+    for map_key, map_config in MAPS.items()
+    for mode_key, mode_config in GAME_MODES.items()
 }
 
-# Set up bot
+@dataclass(frozen=True, slots=True)
+class Challenge:
+    """A created daily challenge; immutable so history can share it without copying."""
+    id: str
+    url: str
+    map: str
+    mode: str
+    created_at: datetime.datetime
+    day_number: int
+    
+    @property
+    def created_unix(self) -> int:
+        """Creation time as a Unix timestamp, for cheap age checks."""
+        return int(self.created_at.timestamp())
+
+# Enhanced storage for multiple challenges; history keeps the last year in memory
+challenge_history: Deque['Challenge'] = deque(maxlen=365)
+current_challenge: Optional['Challenge'] = None
+
+# Ranked (nick, score) pairs parsed out of a highscores response; a tuple so that
+# cached results can't be mutated and can key the format_leaderboard cache
+Leaderboard = Tuple[Tuple[str, int], ...]
+
+@dataclass(frozen=True, slots=True)
+class ChallengeResults:
+    """The top of a challenge leaderboard plus how many players finished it."""
+    top: Leaderboard
+    total_players: int
+
+NO_RESULTS = ChallengeResults(top=(), total_players=0)
+
+class ChallengeBot(commands.Bot):
+    """Bot that owns the shared GeoGuessr HTTP session and challenge database."""
+
+    session: Optional[aiohttp.ClientSession] = None
+    db: Optional[aiosqlite.Connection] = None
+
+    async def setup_hook(self):
+        # Runs once before connecting, unlike on_ready which repeats on reconnect
+        _get_session()
+        # Register the slash side of the hybrid commands with Discord; the text
+        # commands keep working if this fails, so don't abort the login over it
+        guild = discord.Object(id=int(SYNC_GUILD_ID)) if SYNC_GUILD_ID else None
+        if guild is not None:
+            self.tree.copy_global_to(guild=guild)
+        try:
+            await self.tree.sync(guild=guild)
+        except discord.HTTPException as e:
+            log.error("Could not sync slash commands: %s", e)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+        if self.db is not None:
+            await self.db.close()
+        await super().close()
+
+# Set up bot; without the message content intent, commands arrive as slash
+# interactions, with the text form still answering when the bot is mentioned
 intents = discord.Intents.default()
-intents.message_content = True
-bot = commands.Bot(command_prefix='!', intents=intents)
+bot = ChallengeBot(command_prefix=commands.when_mentioned, intents=intents)
+
+def _get_session() -> aiohttp.ClientSession:
+    """Returns the shared GeoGuessr session, creating it on first use."""
+    if bot.session is None or bot.session.closed:
+        # All traffic goes to one host a few times a day: a small pool, with DNS
+        # answers and idle TLS connections kept long enough to be reused
+        connector = aiohttp.TCPConnector(
+            limit=4,
+            ttl_dns_cache=3600,
+            keepalive_timeout=300
+        )
+        bot.session = aiohttp.ClientSession(
+            connector=connector,
+            cookies={"_ncfa": GEOGUESSR_TOKEN},
+            # aiohttp expects a str-returning serializer, orjson returns bytes
+            json_serialize=lambda obj: orjson.dumps(obj).decode(),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return bot.session
+
+async def _get_db() -> aiosqlite.Connection:
+    """Returns the challenge database connection, creating the schema on first use."""
+    if bot.db is None:
+        bot.db = await aiosqlite.connect(CHALLENGE_DB)
+        await bot.db.execute(
+            "CREATE TABLE IF NOT EXISTS challenges ("
+            "id TEXT PRIMARY KEY, url TEXT, map TEXT, mode TEXT, "
+            "created_at TIMESTAMP, day_number INTEGER)"
+        )
+        await bot.db.commit()
+    return bot.db
+
+async def save_challenge(challenge: Challenge):
+    """Stores a newly created daily challenge."""
+    db = await _get_db()
+    await db.execute(
+        "INSERT OR REPLACE INTO challenges VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            challenge.id,
+            challenge.url,
+            challenge.map,
+            challenge.mode,
+            challenge.created_at.isoformat(),
+            challenge.day_number
+        )
+    )
+    await db.commit()
+
+async def next_day_number() -> int:
+    """Returns the day number the next daily challenge should get."""
+    db = await _get_db()
+    async with db.execute("SELECT COALESCE(MAX(day_number), 0) + 1 FROM challenges") as cursor:
+        (day_number,) = await cursor.fetchone()
+    return day_number
+
+async def load_recent_challenges(limit: int = 365) -> List[Challenge]:
+    """Loads up to `limit` of the most recent daily challenges, oldest first."""
+    db = await _get_db()
+    async with db.execute(
+        "SELECT id, url, map, mode, created_at, day_number FROM challenges "
+        "ORDER BY created_at DESC LIMIT ?",
+        (limit,)
+    ) as cursor:
+        rows = await cursor.fetchall()
+    
+    challenges = []
+    for challenge_id, url, map_key, mode_key, created_at, day_number in reversed(rows):
+        created_at = datetime.datetime.fromisoformat(created_at)
+        challenges.append(Challenge(
+            id=challenge_id,
+            url=url,
+            map=map_key,
+            mode=mode_key,
+            created_at=created_at,
+            day_number=day_number
+        ))
+    return challenges
 
 class GeoGuessrAPI:
     """Enhanced GeoGuessr API wrapper with multiple game mode support."""
     
+    # Recently fetched leaderboards: challenge_id -> (fetched_at, results)
+    _results_cache: Dict[str, Tuple[float, ChallengeResults]] = {}
+    
+    # Leaderboard fetches currently in flight, shared by every caller asking for the same ID
+    _inflight_results: Dict[str, asyncio.Task] = {}
+    
+    @classmethod
+    async def _request(cls, method: str, url: str, read, idempotent: bool = True, **kwargs):
+        """Sends a request and returns read(response), retrying connection errors and RETRY_STATUSES.
+        
+        Non-idempotent requests are only retried when they can't have reached the
+        server (failed connects) or were explicitly turned away (NON_IDEMPOTENT_RETRY_STATUSES).
+        """
+        retry_statuses = RETRY_STATUSES if idempotent else NON_IDEMPOTENT_RETRY_STATUSES
+        retry_errors = (aiohttp.ClientConnectionError, asyncio.TimeoutError) if idempotent else aiohttp.ClientConnectorError
+        
+        for attempt in range(1, RETRY_ATTEMPTS + 1):
+            try:
+                async with _get_session().request(method, url, **kwargs) as response:
+                    if response.status not in retry_statuses or attempt == RETRY_ATTEMPTS:
+                        response.raise_for_status()
+                        return await read(response)
+            except retry_errors:
+                if attempt == RETRY_ATTEMPTS:
+                    raise
+            await asyncio.sleep(RETRY_START_TIMEOUT * 2 ** (attempt - 1))
+    
     @staticmethod
-    def create_challenge(map_id: str, game_mode: str) -> Tuple[Optional[str], Optional[str]]:
-        """Creates a new GeoGuessr challenge with specified map and game mode."""
-        if game_mode not in GAME_MODES:
-            return None, None
-            
-        url = "https://www.geoguessr.com/api/v3/challenges"
-        headers = {"Content-Type": "application/json"}
-        cookies = {"_ncfa": GEOGUESSR_TOKEN}
+    async def _read_json(response: aiohttp.ClientResponse):
+        """Reads and decodes a whole JSON response body."""
+        return orjson.loads(await response.read())
+    
+    @staticmethod
+    async def _read_leaderboard(response: aiohttp.ClientResponse, limit: int = LEADERBOARD_SIZE) -> ChallengeResults:
+        """Stream-parses a highscores body, keeping the nick and score of the top `limit` players."""
+        # Players past the limit are only counted, so the player total stays exact
+        leaderboard = []
+        total = 0
+        has_player, nick, score = False, 'Unknown', 0
         
-        # Get game mode settings
-        mode_settings = GAME_MODES[game_mode]['settings']
+        async for prefix, event, value in ijson.parse(response.content):
+            if prefix == 'items.item.game.player' and event == 'start_map':
+                has_player = True
+            elif total >= limit:
+                if has_player and prefix == 'items.item' and event == 'end_map':
+                    total += 1
+                    has_player = False
+            elif prefix == 'items.item.game.player.nick':
+                nick = value
+            elif prefix == 'items.item.game.player.totalScore.amount':
+                score = value
+            elif prefix == 'items.item' and event == 'end_map':
+                if has_player:
+                    leaderboard.append((nick, int(score)))
+                    total += 1
+                has_player, nick, score = False, 'Unknown', 0
         
-        payload = {
-            "map": map_id,
-            **mode_settings  # Unpack the mode-specific settings
-        }
+        return ChallengeResults(top=tuple(leaderboard), total_players=total)
+    
+    @classmethod
+    async def create_challenge(cls, map_key: str, mode_key: str) -> Tuple[Optional[str], Optional[str]]:
+        """Creates a new GeoGuessr challenge with specified map and game mode."""
+        body = CHALLENGE_PAYLOADS.get((map_key, mode_key))
+        if body is None:
+            return None, None
         
         try:
-            response = requests.post(url, headers=headers, cookies=cookies, json=payload)
-            response.raise_for_status()
-            data = response.json()
+            data = await cls._request(
+                "POST",
+                CHALLENGES_URL,
+                cls._read_json,
+                # A repeated POST after a timeout or 5xx could create a second challenge
+                idempotent=False,
+                data=body,
+                headers=JSON_HEADERS
+            )
             challenge_id = data.get('token')
-            challenge_url = f"https://www.geoguessr.com/challenge/{challenge_id}"
+            challenge_url = f"{PLAY_URL}{challenge_id}"
             return challenge_id, challenge_url
-        except requests.RequestException as e:
-            print(f"Error creating challenge: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+            log.error("Error creating challenge: %s", e)
             return None, None
     
-    @staticmethod
-    def get_challenge_results(challenge_id: str) -> Optional[dict]:
-        """Gets the results/leaderboard for a specific challenge."""
-        url = f"https://www.geoguessr.com/api/v3/results/highscores/{challenge_id}"
-        cookies = {"_ncfa": GEOGUESSR_TOKEN}
+    @classmethod
+    async def get_challenge_results(cls, challenge_id: str) -> Optional[ChallengeResults]:
+        """Gets the results/leaderboard for a specific challenge, reusing recent fetches."""
+        now = time.monotonic()
+        cached = cls._results_cache.get(challenge_id)
+        if cached and now - cached[0] < RESULTS_CACHE_TTL:
+            return cached[1]
+        
+        # Join a fetch that is already running instead of sending a duplicate request
+        task = cls._inflight_results.get(challenge_id)
+        if task is None:
+            task = asyncio.create_task(cls._fetch_and_cache_results(challenge_id))
+            cls._inflight_results[challenge_id] = task
+            task.add_done_callback(lambda _: cls._inflight_results.pop(challenge_id, None))
         
+        # Shielded so one caller being cancelled doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+    
+    @classmethod
+    def forget_results(cls, challenge_id: str):
+        """Drops any cached leaderboard so the next lookup fetches fresh results."""
+        cls._results_cache.pop(challenge_id, None)
+    
+    @classmethod
+    async def _fetch_and_cache_results(cls, challenge_id: str) -> Optional[ChallengeResults]:
+        """Fetches a leaderboard and stores it in the results cache."""
+        results = await cls._fetch_challenge_results(challenge_id)
+        if results is not None:
+            now = time.monotonic()
+            # Drop expired entries so the cache doesn't grow with every ID ever queried
+            for key in [k for k, (ts, _) in cls._results_cache.items() if now - ts >= RESULTS_CACHE_TTL]:
+                del cls._results_cache[key]
+            cls._results_cache[challenge_id] = (now, results)
+        return results
+    
+    @classmethod
+    async def _fetch_challenge_results(cls, challenge_id: str) -> Optional[ChallengeResults]:
+        """Fetches the results/leaderboard for a specific challenge from GeoGuessr."""
         try:
-            response = requests.get(url, cookies=cookies)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Error getting challenge results: {e}")
+            return await cls._request(
+                "GET",
+                HIGHSCORES_URL + challenge_id,
+                cls._read_leaderboard
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ijson.JSONError, ValueError) as e:
+            log.error("Error getting challenge results: %s", e)
             return None
 
-def get_today_rotation() -> Dict[str, str]:
-    """Gets today's map and mode based on the weekly rotation."""
-    today = datetime.datetime.now().weekday()  # Monday = 0, Sunday = 6
-    return DAILY_ROTATION[today]
+# Shared fallback for map/mode keys that are no longer configured
+_UNKNOWN = {'name': 'Unknown'}
 
-def format_leaderboard(results: dict, max_players: int = 10) -> List[str]:
-    """Formats challenge results into a leaderboard."""
-    leaderboard = []
-    
-    if 'items' in results and isinstance(results['items'], list):
-        player_list = results['items'][:max_players]  # Limit to top players
-        
-        for i, player_data in enumerate(player_list, 1):
-            if 'game' in player_data and 'player' in player_data['game']:
-                player = player_data['game']['player']
-                nick = player.get('nick', 'Unknown')
-                score = player.get('totalScore', {}).get('amount', '0')
-                
-                # Add medal emojis for top 3
-                medal = ""
-                if i == 1:
-                    medal = "🥇 "
-                elif i == 2:
-                    medal = "🥈 "
-                elif i == 3:
-                    medal = "🥉 "
-                
-                leaderboard.append(f"{medal}{i}. **{nick}** - {score:,}")
-    
-    return leaderboard
+def _names(map_key: str, mode_key: str) -> Tuple[str, str]:
+    """Gets the display names of a map and mode, or 'Unknown' for unconfigured keys."""
+    return MAPS.get(map_key, _UNKNOWN)['name'], GAME_MODES.get(mode_key, _UNKNOWN)['name']
+
+def get_today_rotation() -> Tuple[str, str]:
+    """Gets today's (map, mode) based on the weekly rotation."""
+    # Monday = 0, Sunday = 6
+    return _ROTATION_TUP[datetime.datetime.now(datetime.timezone.utc).weekday()]
+
+# Medal prefixes for the top three ranks; everyone below gets none
+MEDALS = ("🥇 ", "🥈 ", "🥉 ")
+
+# Cached results come back as the same tuple, so repeat lookups skip the formatting
+@functools.lru_cache(maxsize=32)
+def format_leaderboard(results: Leaderboard, max_players: int = LEADERBOARD_SIZE) -> str:
+    """Formats challenge results into a newline-separated leaderboard."""
+    medals = itertools.chain(MEDALS, itertools.repeat(""))
+    return "\n".join([
+        f"{medal}{rank}. **{nick}** - {score:,}"
+        for rank, medal, (nick, score) in zip(
+            itertools.count(1),
+            medals,
+            itertools.islice(results, max_players)  # Limit to top players
+        )
+    ])
 
 @bot.event
 async def on_ready():
-    print(f'{bot.user.name} has connected to Discord!')
-    print(f'Available maps: {", ".join(MAPS.keys())}')
-    print(f'Available modes: {", ".join(GAME_MODES.keys())}')
+    global current_challenge
+    
+    # Pick up where we left off after a restart
+    if current_challenge is None:
+        restored = await load_recent_challenges(challenge_history.maxlen)
+        if restored:
+            challenge_history.extend(restored)
+            current_challenge = restored[-1]
+            log.info("Restored %d challenges, latest #%d (%s)", len(restored), current_challenge.day_number, current_challenge.id)
+    
+    log.info("%s has connected to Discord!", bot.user.name)
+    log.info("Available maps: %s", ", ".join(MAPS.keys()))
+    log.info("Available modes: %s", ", ".join(GAME_MODES.keys()))
+
+# Fixed parts of the embeds the bot posts over and over; the per-call
+# title, description and fields are merged in with discord.Embed.from_dict
+_CUSTOM_CHALLENGE_EMBED = {'title': "Custom Challenge Created", 'color': 0x9B59B6}
+_RESULTS_EMBED = {'color': 0xFF6B6B}
+_LEADERBOARD_EMBED = {'color': 0x3498DB}
+_STATUS_EMBED = {'title': "Bot Status", 'color': 0x95A5A6}
+
+# Daily challenge embeds only differ in day number and link once the map and mode
+# are known, so keep one field-less template per pair and .copy() it per post
+_CHALLENGE_EMBEDS = {
+    (map_key, mode_key): discord.Embed(
+        description=f"**{map_config['name']}** | {_MODE_DESC[mode_key]}",
+        color=0x4ECDC4
+    )
+    for map_key, map_config in MAPS.items()
+    for mode_key in GAME_MODES
+}
+
+# Background task running _daily_runner, or None while daily posting is off
+daily_task: Optional[asyncio.Task] = None
+
+# When the running daily task will next fire (UTC), or None while it is off
+next_daily_run: Optional[datetime.datetime] = None
+
+def daily_task_running() -> bool:
+    """Checks whether the daily challenge task is active."""
+    return daily_task is not None and not daily_task.done()
+
+async def _daily_runner():
+    """Sleeps until the next DAILY_POST_TIME and runs the daily cycle, forever."""
+    global next_daily_run
+    last_target = None
+    while True:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        target = now.replace(
+            hour=DAILY_POST_TIME.hour,
+            minute=DAILY_POST_TIME.minute,
+            second=0,
+            microsecond=0
+        )
+        if target <= now:
+            target += datetime.timedelta(days=1)
+        # A cycle that finished before the wall clock reached the post time must
+        # not fire the same slot again
+        if last_target is not None and target <= last_target:
+            target = last_target + datetime.timedelta(days=1)
+        
+        next_daily_run = target
+        # asyncio sleeps on the monotonic clock, which can wake up a little before
+        # the target by wall clock, so keep sleeping until it has really passed
+        while (remaining := (target - now).total_seconds()) > 0:
+            await asyncio.sleep(remaining)
+            now = datetime.datetime.now(datetime.timezone.utc)
+        last_target = target
+        
+        try:
+            await daily_challenge_cycle()
+        except Exception as e:
+            # Keep tomorrow's run scheduled even if today's failed
+            log.exception("Error in daily cycle: %s", e)
+
+# Serializes daily cycles so a /force_daily during the scheduled run can't double-post
+_daily_cycle_lock = asyncio.Lock()
 
-@tasks.loop(time=datetime.time(hour=12, minute=0))  # Post at 12:00 PM UTC
 async def daily_challenge_cycle():
     """Posts previous day's results and creates a new daily challenge."""
-    # Use the first allowed channel for daily posts
-    target_channel = bot.get_channel(ALLOWED_CHANNELS[0])
-    
-    if not target_channel:
-        print("❌ No valid channel found for daily challenge posting!")
-        return
-    
-    # First, post results from yesterday's challenge if it exists
-    if current_challenge['id']:
-        await post_previous_results(target_channel)
-        await asyncio.sleep(2)  # Small delay between messages
-    
-    # Create today's new challenge
-    await create_todays_challenge(target_channel)
+    async with _daily_cycle_lock:
+        # Use the first allowed channel for daily posts
+        target_channel = bot.get_channel(ALLOWED_CHANNELS[0])
+        
+        if not target_channel:
+            log.error("No valid channel found for daily challenge posting!")
+            return
+        
+        previous = current_challenge
+        if previous:
+            # Final results must be fresh, not whatever /leaderboard fetched earlier
+            GeoGuessrAPI.forget_results(previous.id)
+            
+            # Yesterday's results and today's challenge don't depend on each other
+            results, challenge = await asyncio.gather(
+                GeoGuessrAPI.get_challenge_results(previous.id),
+                create_todays_challenge()
+            )
+            await send_previous_results(target_channel, previous, results)
+        else:
+            challenge = await create_todays_challenge()
+        
+        await send_challenge_embed(target_channel, challenge)
 
-async def post_previous_results(channel):
-    """Posts results from the previous challenge."""
-    results = GeoGuessrAPI.get_challenge_results(current_challenge['id'])
-    
-    if not results:
+async def send_previous_results(channel, challenge: Challenge, results: Optional[ChallengeResults]):
+    """Posts the final results of a previous challenge."""
+    if results is None:
         await channel.send("⚠️ Could not retrieve results from yesterday's challenge.")
         return
     
     # Get previous challenge info
-    prev_map = MAPS.get(current_challenge['map'], {})
-    prev_mode = GAME_MODES.get(current_challenge['mode'], {})
+    map_name, mode_name = _names(challenge.map, challenge.mode)
     
-    leaderboard = format_leaderboard(results)
-    
-    embed = discord.Embed(
-        title=f"Final Results - Day #{current_challenge['day_number']}",
-        description=f"**{prev_map.get('name', 'Unknown')}** | **{prev_mode.get('name', 'Unknown')}**",
-        color=0xFF6B6B
-    )
+    leaderboard = format_leaderboard(results.top)
     
     if leaderboard:
-        embed.add_field(
-            name="Leaderboard",
-            value="\n".join(leaderboard),
-            inline=False
-        )
-        
-        # Add some stats
-        total_players = len(results.get('items', []))
-        embed.add_field(name="Total Players", value=str(total_players), inline=True)
-        
-        if total_players > 0:
-            # Get winner info
-            winner_data = results['items'][0]['game']['player']
-            winner_score = winner_data.get('totalScore', {}).get('amount', 0)
-            embed.add_field(name="Winning Score", value=f"{winner_score:,}", inline=True)
+        # Add some stats; the winner is the first ranked player
+        fields = [
+            {'name': "Leaderboard", 'value': leaderboard, 'inline': False},
+            {'name': "Total Players", 'value': str(results.total_players), 'inline': True},
+            {'name': "Winning Score", 'value': f"{results.top[0][1]:,}", 'inline': True}
+        ]
     else:
-        embed.add_field(
-            name="No Results",
-            value="No one completed yesterday's challenge.",
-            inline=False
-        )
+        fields = [{'name': "No Results", 'value': "No one completed yesterday's challenge.", 'inline': False}]
+    
+    embed = discord.Embed.from_dict({
+        **_RESULTS_EMBED,
+        'title': f"Final Results - Day #{challenge.day_number}",
+        'description': f"**{map_name}** | **{mode_name}**",
+        'fields': fields
+    })
     
     await channel.send(embed=embed)
 
-async def create_todays_challenge(channel):
-    """Creates and posts today's new challenge."""
-    rotation = get_today_rotation()
-    map_key = rotation['map']
-    mode_key = rotation['mode']
-    
-    map_config = MAPS.get(map_key)
-    mode_config = GAME_MODES.get(mode_key)
+async def create_todays_challenge() -> Optional[Challenge]:
+    """Creates today's new challenge and makes it the current one."""
+    map_key, mode_key = get_today_rotation()
     
-    if not map_config or not mode_config:
-        await channel.send("❌ Invalid map or mode configuration for today.")
-        return
+    if map_key not in MAPS or mode_key not in GAME_MODES:
+        log.error("Invalid map or mode configuration for today: %s + %s", map_key, mode_key)
+        return None
     
     # Create the challenge
-    challenge_id, challenge_url = GeoGuessrAPI.create_challenge(
-        map_config['id'], 
-        mode_key
-    )
+    challenge_id, challenge_url = await GeoGuessrAPI.create_challenge(map_key, mode_key)
     
     if not challenge_id:
-        await channel.send("❌ Failed to create today's challenge. Please try again later.")
-        return
+        return None
     
     # Update current challenge info
     global current_challenge
-    current_challenge = {
-        'id': challenge_id,
-        'url': challenge_url,
-        'map': map_key,
-        'mode': mode_key,
-        'created_at': datetime.datetime.now(),
-        'day_number': current_challenge['day_number'] + 1
-    }
+    day_number = await next_day_number()
+    current_challenge = Challenge(
+        id=challenge_id,
+        url=challenge_url,
+        map=map_key,
+        mode=mode_key,
+        created_at=datetime.datetime.now(datetime.timezone.utc),
+        day_number=day_number
+    )
     
     # Add to history
-    challenge_history.append(current_challenge.copy())
+    challenge_history.append(current_challenge)
+    await save_challenge(current_challenge)
+    return current_challenge
+
+async def send_challenge_embed(channel, challenge: Optional[Challenge]):
+    """Posts a newly created daily challenge, or the failure notice if there is none."""
+    if challenge is None:
+        await channel.send("❌ Failed to create today's challenge. Please try again later.")
+        return
     
     # Create clean embed
-    embed = discord.Embed(
-        title=f"Daily Challenge #{current_challenge['day_number']}",
-        description=f"**{map_config['name']}** | **{mode_config['name']}** | **{mode_config['settings']['timeLimit']}s**",
-        color=0x4ECDC4
-    )
-    
-    embed.add_field(
-        name="Play Challenge",
-        value=f"[Click here to play]({challenge_url})",
-        inline=False
-    )
+    embed = _CHALLENGE_EMBEDS[(challenge.map, challenge.mode)].copy()
+    embed.title = f"Daily Challenge #{challenge.day_number}"
+    embed.add_field(name="Play Challenge", value=f"[Click here to play]({challenge.url})", inline=False)
     
     await channel.send(embed=embed)
 
 # Enhanced Commands
 
-@bot.command(name='challenge')
+@bot.check
+async def _channel_gate(ctx):
+    """Only answers commands sent in one of the allowed channels."""
+    return ctx.channel.id in _ALLOWED_CHANNEL_IDS
+
+# Slash command pickers for the custom challenge options
+_MAP_CHOICES = [app_commands.Choice(name=config['name'], value=key) for key, config in MAPS.items()]
+_MODE_CHOICES = [app_commands.Choice(name=config['name'], value=key) for key, config in GAME_MODES.items()]
+
+@bot.hybrid_command(name='challenge')
+@app_commands.describe(map_name="Map to play (defaults to today's rotation)", mode_name="Game mode to play")
+@app_commands.choices(map_name=_MAP_CHOICES, mode_name=_MODE_CHOICES)
 async def manual_challenge(ctx, map_name: str = None, mode_name: str = None):
     """Creates a custom challenge with specified map and mode."""
-    if not is_allowed_channel(ctx):
-        return
-    
     # If no parameters, use today's rotation
     if not map_name or not mode_name:
-        rotation = get_today_rotation()
-        map_name = rotation['map']
-        mode_name = rotation['mode']
+        map_name, mode_name = get_today_rotation()
         await ctx.send(f"Using today's rotation: {map_name} + {mode_name}")
     
     # Validate inputs
@@ -326,95 +674,90 @@ async def manual_challenge(ctx, map_name: str = None, mode_name: str = None):
         await ctx.send(f"❌ Invalid mode. Available modes: `{available_modes}`")
         return
     
-    await ctx.send("Creating custom challenge...")
+    # Post the notice while the API call is in flight instead of before it
+    notice = asyncio.create_task(ctx.send("Creating custom challenge..."))
     
     map_config = MAPS[map_name]
-    challenge_id, challenge_url = GeoGuessrAPI.create_challenge(map_config['id'], mode_name)
+    challenge_id, challenge_url = await GeoGuessrAPI.create_challenge(map_name, mode_name)
+    await notice
     
     if not challenge_id:
         await ctx.send("❌ Failed to create challenge.")
         return
     
-    mode_config = GAME_MODES[mode_name]
-    
-    embed = discord.Embed(
-        title="Custom Challenge Created",
-        description=f"**{map_config['name']}** | **{mode_config['name']}** | **{mode_config['settings']['timeLimit']}s**",
-        color=0x9B59B6
-    )
-    
-    embed.add_field(name="Play Challenge", value=f"[Click here to play]({challenge_url})", inline=False)
-    embed.add_field(name="Challenge ID", value=f"`{challenge_id}`", inline=False)
+    embed = discord.Embed.from_dict({
+        **_CUSTOM_CHALLENGE_EMBED,
+        'description': f"**{map_config['name']}** | {_MODE_DESC[mode_name]}",
+        'fields': [
+            {'name': "Play Challenge", 'value': f"[Click here to play]({challenge_url})", 'inline': False},
+            {'name': "Challenge ID", 'value': f"`{challenge_id}`", 'inline': False}
+        ]
+    })
     
     await ctx.send(embed=embed)
 
-@bot.command(name='leaderboard', aliases=['lb'])
+@bot.hybrid_command(name='leaderboard', aliases=['lb'])
+@app_commands.describe(challenge_id="Challenge ID to look up (defaults to the current challenge)")
 async def get_leaderboard(ctx, challenge_id: str = None):
     """Gets the leaderboard for current or specified challenge."""
-    if not is_allowed_channel(ctx):
-        return
-    
     # Use current challenge if no ID specified
     if not challenge_id:
-        if not current_challenge['id']:
-            await ctx.send("❌ No active challenge. Create one with `!challenge`")
+        if not current_challenge:
+            await ctx.send("❌ No active challenge. Create one with `/challenge`")
             return
-        challenge_id = current_challenge['id']
+        challenge_id = current_challenge.id
         is_current = True
     else:
         is_current = False
     
-    await ctx.send("Fetching leaderboard...")
-    
-    results = GeoGuessrAPI.get_challenge_results(challenge_id)
-    if not results:
-        await ctx.send("❌ Could not retrieve leaderboard.")
-        return
+    # Nobody can have finished a challenge created moments ago, so skip the API call
+    if is_current and time.time() - current_challenge.created_unix < FRESH_CHALLENGE_SECONDS:
+        results = NO_RESULTS
+    else:
+        notice = asyncio.create_task(ctx.send("Fetching leaderboard..."))
+        
+        results = await GeoGuessrAPI.get_challenge_results(challenge_id)
+        await notice
+        if results is None:
+            await ctx.send("❌ Could not retrieve leaderboard.")
+            return
     
-    leaderboard = format_leaderboard(results)
+    leaderboard = format_leaderboard(results.top)
     
     if is_current:
-        map_config = MAPS.get(current_challenge['map'], {})
-        mode_config = GAME_MODES.get(current_challenge['mode'], {})
-        title = f"Current Leaderboard - Day #{current_challenge['day_number']}"
-        description = f"**{map_config.get('name', 'Unknown')}** | **{mode_config.get('name', 'Unknown')}**"
+        map_name, mode_name = _names(current_challenge.map, current_challenge.mode)
+        title = f"Current Leaderboard - Day #{current_challenge.day_number}"
+        description = f"**{map_name}** | **{mode_name}**"
     else:
         title = f"Challenge Leaderboard"
         description = f"Challenge ID: `{challenge_id}`"
     
-    embed = discord.Embed(title=title, description=description, color=0x3498DB)
-    
     if leaderboard:
-        embed.add_field(
-            name="Rankings",
-            value="\n".join(leaderboard),
-            inline=False
-        )
-        
-        total_players = len(results.get('items', []))
-        embed.add_field(name="Players", value=str(total_players), inline=True)
+        fields = [
+            {'name': "Rankings", 'value': leaderboard, 'inline': False},
+            {'name': "Players", 'value': str(results.total_players), 'inline': True}
+        ]
         
         if is_current:
-            embed.add_field(
-                name="Join Challenge",
-                value=f"[Play now]({current_challenge['url']})",
-                inline=True
-            )
+            fields.append({'name': "Join Challenge", 'value': f"[Play now]({current_challenge.url})", 'inline': True})
     else:
-        embed.add_field(
-            name="No Results Yet",
-            value="No one has completed this challenge yet.",
-            inline=False
-        )
+        fields = [{'name': "No Results Yet", 'value': "No one has completed this challenge yet.", 'inline': False}]
+    
+    embed = discord.Embed.from_dict({
+        **_LEADERBOARD_EMBED,
+        'title': title,
+        'description': description,
+        'fields': fields
+    })
     
     await ctx.send(embed=embed)
 
-@bot.command(name='schedule')
-async def show_schedule(ctx):
-    """Shows the weekly rotation schedule."""
-    if ctx.channel.id != CHANNEL_ID:
-        return
-    
+SCHEDULE_FOOTER = "Use /challenge [map] [mode] for custom challenges"
+
+# The schedule, map and mode listings only depend on static config, so their
+# embeds are built once at import; the schedule gets one copy per weekday
+def _build_schedule_embed(today: int) -> discord.Embed:
+    """Builds the weekly schedule embed with the given weekday highlighted."""
     embed = discord.Embed(
         title="Weekly Challenge Schedule",
         description="Here's what to expect each day of the week:",
@@ -428,7 +771,7 @@ async def show_schedule(ctx):
         map_config = MAPS[rotation['map']]
         mode_config = GAME_MODES[rotation['mode']]
         
-        is_today = i == datetime.datetime.now().weekday()
+        is_today = i == today
         day_name = f"**{day}**" if is_today else day
         if is_today:
             day_name += " (Today)"
@@ -439,15 +782,11 @@ async def show_schedule(ctx):
             inline=True
         )
     
-    embed.set_footer(text="Use !challenge [map] [mode] for custom challenges")
-    await ctx.send(embed=embed)
+    embed.set_footer(text=SCHEDULE_FOOTER)
+    return embed
 
-@bot.command(name='maps')
-async def list_maps(ctx):
-    """Lists all available maps."""
-    if ctx.channel.id != CHANNEL_ID:
-        return
-    
+def _build_maps_embed() -> discord.Embed:
+    """Builds the available maps embed."""
     embed = discord.Embed(
         title="Available Maps",
         color=0x27AE60
@@ -472,15 +811,10 @@ async def list_maps(ctx):
     embed.add_field(name="Move Mode", value="\n".join(move_maps), inline=False)
     embed.add_field(name="No Move Mode", value="\n".join(nomove_maps), inline=False) 
     embed.add_field(name="NMPZ Mode", value="\n".join(nmpz_maps), inline=False)
-    
-    await ctx.send(embed=embed)
+    return embed
 
-@bot.command(name='modes')
-async def list_modes(ctx):
-    """Lists all available game modes."""
-    if ctx.channel.id != CHANNEL_ID:
-        return
-    
+def _build_modes_embed() -> discord.Embed:
+    """Builds the available game modes embed."""
     embed = discord.Embed(
         title="Available Game Modes",
         color=0x8E44AD
@@ -506,163 +840,180 @@ async def list_modes(ctx):
             value=f"`{key}` - {time_limit}s | {', '.join(restrictions)}",
             inline=False
         )
-    
-    await ctx.send(embed=embed)
+    return embed
+
+SCHEDULE_EMBEDS = tuple(_build_schedule_embed(day) for day in range(7))
+MAPS_EMBED = _build_maps_embed()
+MODES_EMBED = _build_modes_embed()
 
-@bot.command(name='status')
+@bot.hybrid_command(name='schedule')
+async def show_schedule(ctx):
+    """Shows the weekly rotation schedule."""
+    await ctx.send(embed=SCHEDULE_EMBEDS[datetime.datetime.now(datetime.timezone.utc).weekday()])
+
+@bot.hybrid_command(name='maps')
+async def list_maps(ctx):
+    """Lists all available maps."""
+    await ctx.send(embed=MAPS_EMBED)
+
+@bot.hybrid_command(name='modes')
+async def list_modes(ctx):
+    """Lists all available game modes."""
+    await ctx.send(embed=MODES_EMBED)
+
+@bot.hybrid_command(name='status')
 async def check_status(ctx):
     """Shows detailed status of the current challenge and bot."""
-    if ctx.channel.id != CHANNEL_ID:
-        return
-    
-    embed = discord.Embed(
-        title="Bot Status",
-        color=0x95A5A6
-    )
-    
-    if current_challenge['id']:
-        map_config = MAPS.get(current_challenge['map'], {})
-        mode_config = GAME_MODES.get(current_challenge['mode'], {})
-        
-        created_time = current_challenge['created_at']
-        time_ago = datetime.datetime.now() - created_time
-        hours_ago = int(time_ago.total_seconds() / 3600)
+    if current_challenge:
+        map_name, mode_name = _names(current_challenge.map, current_challenge.mode)
         
-        embed.add_field(
-            name="Current Challenge",
-            value=f"Day #{current_challenge['day_number']}\n{map_config.get('name', 'Unknown')} | {mode_config.get('name', 'Unknown')}",
-            inline=False
-        )
-        
-        embed.add_field(name="Challenge ID", value=f"`{current_challenge['id']}`", inline=True)
-        embed.add_field(name="Created", value=f"{hours_ago}h ago", inline=True)
-        embed.add_field(name="Play", value=f"[Link]({current_challenge['url']})", inline=True)
+        fields = [
+            {
+                'name': "Current Challenge",
+                'value': f"Day #{current_challenge.day_number}\n{map_name} | {mode_name}",
+                'inline': False
+            },
+            {'name': "Challenge ID", 'value': f"`{current_challenge.id}`", 'inline': True},
+            # Discord renders and keeps updating the relative time client-side
+            {'name': "Created", 'value': discord.utils.format_dt(current_challenge.created_at, style='R'), 'inline': True},
+            {'name': "Play", 'value': f"[Link]({current_challenge.url})", 'inline': True}
+        ]
     else:
-        embed.add_field(
-            name="No Active Challenge",
-            value="Use `!challenge` to create one",
-            inline=False
-        )
+        fields = [{'name': "No Active Challenge", 'value': "Use `/challenge` to create one", 'inline': False}]
     
     # Daily task status
-    task_status = "Running" if not daily_challenge_cycle.is_cancelled() else "Stopped"
-    embed.add_field(name="Daily Tasks", value=task_status, inline=True)
-    
-    # Next daily challenge time
-    now = datetime.datetime.now()
-    tomorrow_noon = (now + datetime.timedelta(days=1)).replace(hour=12, minute=0, second=0, microsecond=0)
-    time_until = tomorrow_noon - now
-    hours_until = int(time_until.total_seconds() / 3600)
+    task_status = "Running" if daily_task_running() else "Stopped"
+    fields.append({'name': "Daily Tasks", 'value': task_status, 'inline': True})
     
-    embed.add_field(name="Next Daily", value=f"in {hours_until}h", inline=True)
+    # Next daily challenge time, as scheduled by the running task
+    if daily_task_running() and next_daily_run is not None:
+        next_daily = discord.utils.format_dt(next_daily_run, style='R')
+    else:
+        next_daily = "Not scheduled"
     
-    embed.add_field(name="Total Challenges", value=str(len(challenge_history)), inline=True)
+    fields.append({'name': "Next Daily", 'value': next_daily, 'inline': True})
+    # history is capped, the day number counts every daily challenge ever created
+    fields.append({'name': "Total Challenges", 'value': str(current_challenge.day_number if current_challenge else 0), 'inline': True})
     
-    await ctx.send(embed=embed)
+    await ctx.send(embed=discord.Embed.from_dict({**_STATUS_EMBED, 'fields': fields}))
 
-@bot.command(name='start_daily')
+@bot.hybrid_command(name='start_daily')
 async def start_daily_task(ctx):
     """Starts the daily challenge cycle."""
-    if ctx.channel.id != CHANNEL_ID:
-        return
-    
-    if not daily_challenge_cycle.is_cancelled():
+    global daily_task
+    if daily_task_running():
         await ctx.send("✅ Daily challenges are already running!")
         return
     
-    daily_challenge_cycle.start()
+    daily_task = asyncio.create_task(_daily_runner())
     await ctx.send("🚀 Daily challenge cycle started! New challenges will post at 12:00 PM UTC.")
 
-@bot.command(name='stop_daily')
+@bot.hybrid_command(name='stop_daily')
 async def stop_daily_task(ctx):
     """Stops the daily challenge cycle."""
-    if ctx.channel.id != CHANNEL_ID:
-        return
-    
-    daily_challenge_cycle.cancel()
+    global daily_task, next_daily_run
+    if daily_task is not None:
+        daily_task.cancel()
+        daily_task = None
+        next_daily_run = None
     await ctx.send("⏹️ Daily challenge cycle stopped.")
 
-@bot.command(name='force_daily')
+@bot.hybrid_command(name='force_daily')
 async def force_daily_cycle(ctx):
     """Manually triggers the daily cycle (results + new challenge)."""
-    if ctx.channel.id != CHANNEL_ID:
-        return
-    
     await ctx.send("🔄 Manually triggering daily cycle...")
     await daily_challenge_cycle()
 
-@bot.command(name='help_geo')
+# The help text never changes, so build its embed once at import
+HELP_EMBED = discord.Embed(
+    title="GeoGuessr Multi-Mode Challenge Bot",
+    description="Your GeoGuessr challenge companion",
+    color=0x2ECC71
+)
+
+# Basic Commands
+HELP_EMBED.add_field(
+    name="Challenge Commands",
+    value=(
+        "`/challenge` - Create today's scheduled challenge\n"
+        "`/challenge [map] [mode]` - Create custom challenge\n"
+        "`/leaderboard` - Show current challenge leaderboard\n"
+        "`/leaderboard [id]` - Show specific challenge results"
+    ),
+    inline=False
+)
+
+# Information Commands  
+HELP_EMBED.add_field(
+    name="Information Commands",
+    value=(
+        "`/schedule` - View weekly rotation schedule\n"
+        "`/maps` - List all available maps\n" 
+        "`/modes` - List all available game modes\n"
+        "`/status` - Show bot and challenge status"
+    ),
+    inline=False
+)
+
+# Admin Commands
+HELP_EMBED.add_field(
+    name="Admin Commands",
+    value=(
+        "`/start_daily` - Start automatic daily challenges\n"
+        "`/stop_daily` - Stop automatic daily challenges\n"
+        "`/force_daily` - Manually trigger daily cycle"
+    ),
+    inline=False
+)
+
+HELP_EMBED.add_field(
+    name="Features",
+    value=(
+        "Multiple maps and game modes\n"
+        "Weekly rotation schedule\n"
+        "Automatic daily results posting\n"
+        "Custom challenge creation"
+    ),
+    inline=False
+)
+
+@bot.hybrid_command(name='help_geo')
 async def help_geo(ctx):
     """Shows comprehensive help for all bot commands."""
-    if ctx.channel.id != CHANNEL_ID:
-        return
-    
-    embed = discord.Embed(
-        title="GeoGuessr Multi-Mode Challenge Bot",
-        description="Your GeoGuessr challenge companion",
-        color=0x2ECC71
-    )
-    
-    # Basic Commands
-    embed.add_field(
-        name="Challenge Commands",
-        value=(
-            "`!challenge` - Create today's scheduled challenge\n"
-            "`!challenge [map] [mode]` - Create custom challenge\n"
-            "`!leaderboard` - Show current challenge leaderboard\n"
-            "`!leaderboard [id]` - Show specific challenge results"
-        ),
-        inline=False
-    )
-    
-    # Information Commands  
-    embed.add_field(
-        name="Information Commands",
-        value=(
-            "`!schedule` - View weekly rotation schedule\n"
-            "`!maps` - List all available maps\n" 
-            "`!modes` - List all available game modes\n"
-            "`!status` - Show bot and challenge status"
-        ),
-        inline=False
-    )
-    
-    # Admin Commands
-    embed.add_field(
-        name="Admin Commands",
-        value=(
-            "`!start_daily` - Start automatic daily challenges\n"
-            "`!stop_daily` - Stop automatic daily challenges\n"
-            "`!force_daily` - Manually trigger daily cycle"
-        ),
-        inline=False
-    )
-    
-    embed.add_field(
-        name="Features",
-        value=(
-            "Multiple maps and game modes\n"
-            "Weekly rotation schedule\n"
-            "Automatic daily results posting\n"
-            "Custom challenge creation"
-        ),
-        inline=False
-    )
-    
-    await ctx.send(embed=embed)
+    await ctx.send(embed=HELP_EMBED)
 
 # Error handling
 @bot.event
 async def on_command_error(ctx, error):
-    if isinstance(error, commands.CommandNotFound):
-        return  # Ignore unknown commands
+    if isinstance(error, (commands.CommandNotFound, commands.CheckFailure)):
+        # Ignore unknown commands and commands outside allowed channels, but slash
+        # commands still need an answer or Discord shows them as failed
+        if ctx.interaction is not None and not ctx.interaction.response.is_done():
+            await ctx.send("❌ This bot only answers in its challenge channels.", ephemeral=True)
+        return
     elif isinstance(error, commands.MissingRequiredArgument):
-        await ctx.send(f"❌ Missing required argument. Use `!help_geo` for command help.")
+        await ctx.send(f"❌ Missing required argument. Use `/help_geo` for command help.")
     else:
-        print(f"Error: {error}")
+        log.error("Error: %s", error, exc_info=error)
         await ctx.send(f"❌ An error occurred: {str(error)}")
 
 # Run the bot
 if __name__ == "__main__":
-    print("🚀 Starting Enhanced GeoGuessr Challenge Bot...")
-    bot.run(TOKEN)
+    missing = [name for name, value in (('DISCORD_TOKEN', TOKEN), ('GEOGUESSR_TOKEN', GEOGUESSR_TOKEN)) if not value]
+    if missing:
+        raise SystemExit(f"❌ Missing environment variables: {', '.join(missing)}")
+    
+    # uvloop is optional (not available on Windows); fall back to the stdlib loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    _log_listener.start()
+    log.info("🚀 Starting Enhanced GeoGuessr Challenge Bot...")
+    try:
+        bot.run(TOKEN)
+    finally:
+        # Flush whatever is still queued before the interpreter exits
+        _log_listener.stop()